@@ -2,11 +2,12 @@
 
 # pylint: disable=import-outside-toplevel
 import asyncio
+import collections
 import datetime
 import logging
 import threading
 import time
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Set, Tuple
 import uuid
 
 from sky import exceptions as sky_exceptions
@@ -31,6 +32,30 @@ _LAZY_MODULES = (azure,)
 _session_creation_lock = threading.RLock()
 _MAX_RETRY_FOR_GET_SUBSCRIPTION_ID = 5
 
+# Clients created by get_client, keyed by the arguments of get_client, in
+# least recently used order. Bounded like the lru_cache it replaces, as
+# container clients are created per container.
+_CLIENT_CACHE_MAX_SIZE = 128
+_client_cache: 'collections.OrderedDict[Tuple[Any, ...], Client]' = (
+    collections.OrderedDict())
+# Per-key locks for get_client, so that concurrent cache misses for the same
+# client only create it once (and only do one credential token exchange),
+# instead of every thread creating its own client as with lru_cache. A lock
+# is only kept while its client is being created.
+_client_key_locks: Dict[Tuple[Any, ...], threading.Lock] = {}
+# Incremented by get_client.cache_clear(), so that clients being created
+# while the cache is cleared are not stored in the cleared cache.
+_client_cache_epoch = 0
+# Guards _client_cache, _client_key_locks and _client_cache_epoch.
+_client_cache_lock = threading.Lock()
+# Container URLs that are known to be private, i.e. checking them without
+# credentials failed. The anonymous check is skipped for these when creating
+# their container client again, saving a round trip to Azure.
+_private_container_urls: Set[str] = set()
+# The Azure CLI credential shared by all clients created by get_client.
+_credential: Optional[Any] = None
+_credential_lock = threading.Lock()
+
 
 @common.load_lazy_modules(modules=_LAZY_MODULES)
 @annotations.lru_cache(scope='global', maxsize=1)
@@ -80,14 +105,97 @@ def azure_mgmt_models(name: str):
         return models
 
 
-# We should keep the order of the decorators having 'lru_cache' followed
-# by 'load_lazy_modules' as we need to make sure a caller can call
-# 'get_client.cache_clear', which is a function provided by 'lru_cache'
-@annotations.lru_cache(scope='global')
-@common.load_lazy_modules(modules=_LAZY_MODULES)
+def _get_cached_client(key: Tuple[Any, ...]) -> Optional[Client]:
+    """Returns the cached client. Must be called with _client_cache_lock."""
+    client = _client_cache.get(key)
+    if client is not None:
+        _client_cache.move_to_end(key)
+    return client
+
+
 def get_client(name: str,
                subscription_id: Optional[str] = None,
                **kwargs) -> Client:
+    """Returns a cached Azure client for the specified service.
+
+    The client is created on the first call with the same arguments. Use
+    get_client.cache_clear() to drop the cached clients.
+
+    Args:
+        name: The type of Azure client to create.
+        subscription_id: The Azure subscription ID. Defaults to None.
+
+    Returns:
+        An instance of the specified Azure client.
+
+    Raises:
+        See _create_client.
+    """
+    key = (name, subscription_id, tuple(sorted(kwargs.items())))
+    with _client_cache_lock:
+        client = _get_cached_client(key)
+        if client is not None:
+            return client
+        lock = _client_key_locks.setdefault(key, threading.Lock())
+    with lock:
+        with _client_cache_lock:
+            client = _get_cached_client(key)
+            if client is not None:
+                return client
+            epoch = _client_cache_epoch
+        client = None
+        try:
+            client = _create_client(name, subscription_id, **kwargs)
+        finally:
+            with _client_cache_lock:
+                if client is not None and epoch == _client_cache_epoch:
+                    _client_cache[key] = client
+                    while len(_client_cache) > _CLIENT_CACHE_MAX_SIZE:
+                        _client_cache.popitem(last=False)
+                # Drop the lock in the same critical section as storing the
+                # client, so later callers either hit the cache or create a
+                # new lock.
+                if _client_key_locks.get(key) is lock:
+                    del _client_key_locks[key]
+    return client
+
+
+def _clear_client_cache() -> None:
+    global _credential, _client_cache_epoch
+    with _client_cache_lock:
+        _client_cache.clear()
+        _client_cache_epoch += 1
+    with _credential_lock:
+        _credential = None
+
+
+get_client.cache_clear = _clear_client_cache  # type: ignore[attr-defined]
+
+
+def _get_credential() -> Any:
+    """Returns the Azure CLI credential shared by all clients.
+
+    Reusing one credential avoids creating a new one (and later spawning a
+    new `az account get-access-token` process for it) per client.
+    """
+    global _credential
+    if _credential is not None:
+        return _credential
+    with _credential_lock:
+        if _credential is None:
+            # Sky only supports Azure CLI credential for now.
+            # Increase the timeout to fix the Azure get-access-token timeout
+            # issue. Tracked in
+            # https://github.com/Azure/azure-cli/issues/20404#issuecomment-1249575110 # pylint: disable=line-too-long
+            from azure import identity
+            _credential = identity.AzureCliCredential(process_timeout=30)
+        return _credential
+
+
+@common.load_lazy_modules(modules=_LAZY_MODULES)
+def _create_client(name: str,
+                   subscription_id: Optional[str] = None,
+                   **kwargs) -> Client:
     """Creates and returns an Azure client for the specified service.
 
     Args:
@@ -107,13 +215,8 @@ def get_client(name: str,
         TimeoutError: If unable to get the container client within the
             specified time.
     """
-    # Sky only supports Azure CLI credential for now.
-    # Increase the timeout to fix the Azure get-access-token timeout issue.
-    # Tracked in
-    # https://github.com/Azure/azure-cli/issues/20404#issuecomment-1249575110
-    from azure import identity
     with _session_creation_lock:
-        credential = identity.AzureCliCredential(process_timeout=30)
+        credential = _get_credential()
         if name == 'compute':
             from azure.mgmt import compute
             return compute.ComputeManagementClient(credential, subscription_id)
@@ -174,14 +277,16 @@ def get_client(name: str,
                         f'The storage account {storage_account_name!r} does '
                         'not exist. Please check if the name is correct.')
 
-            # First, assume the URL is from a public container.
-            container_client = blob.ContainerClient.from_container_url(
-                container_url)
-            try:
-                container_client.exists()
-                return container_client
-            except exceptions().ClientAuthenticationError:
-                pass
+            # First, assume the URL is from a public container, unless it is
+            # already known to be private.
+            if container_url not in _private_container_urls:
+                container_client = blob.ContainerClient.from_container_url(
+                    container_url)
+                try:
+                    container_client.exists()
+                    return container_client
+                except exceptions().ClientAuthenticationError:
+                    _private_container_urls.add(container_url)
 
             # If the URL is not for a public container, assume it's private
             # and retry with credentials.
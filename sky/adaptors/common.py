@@ -34,15 +34,22 @@ class LazyImport(types.ModuleType):
         self._lock = threading.RLock()
 
     def load_module(self):
+        # Fast path without the lock once the module is loaded, as this is
+        # called on every call of functions decorated with load_lazy_modules.
+        if self._module is not None:
+            return self._module
         # Avoid extra imports when multiple threads try to import the same
         # module. The overhead is minor since import can only run in serial
         # due to GIL even in multi-threaded environments.
         with self._lock:
             if self._module is None:
                 try:
-                    self._module = importlib.import_module(self._module_name)
+                    module = importlib.import_module(self._module_name)
                     if self._set_loggers is not None:
                         self._set_loggers()
+                    # Only publish the module after the setup is done, as
+                    # other threads return it without taking the lock.
+                    self._module = module
                 except ImportError as e:
                     if self._import_error_message is not None:
                         raise ImportError(self._import_error_message) from e
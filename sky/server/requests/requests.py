@@ -1,12 +1,17 @@
 """Utilities for REST API."""
 import asyncio
 import atexit
+import base64
+import collections
 import contextlib
+import copy
 import dataclasses
 import enum
 import functools
+import itertools
 import os
 import pathlib
+import pickle
 import shutil
 import signal
 import sqlite3
@@ -14,7 +19,7 @@ import threading
 import time
 import traceback
 from typing import (Any, Callable, Dict, Generator, List, NamedTuple, Optional,
-                    Set, Tuple)
+                    Set, Tuple, Union)
 import uuid
 
 import anyio
@@ -36,6 +41,7 @@ from sky.server.requests import storage as request_storage
 from sky.server.requests.serializers import decoders
 from sky.server.requests.serializers import encoders
 from sky.server.requests.serializers import return_value_serializers
+from sky.utils import annotations
 from sky.utils import asyncio_utils
 from sky.utils import common_utils
 from sky.utils import ux_utils
@@ -63,6 +69,7 @@ DEFAULT_REQUESTS_RETENTION_HOURS = 24  # 1 day
 # [ ] Deploy API server in a autoscaling fashion.
 
 
+@functools.total_ordering
 class RequestStatus(enum.Enum):
     """The status of a request."""
 
@@ -73,8 +80,7 @@ class RequestStatus(enum.Enum):
     CANCELLED = 'CANCELLED'
 
     def __gt__(self, other):
-        return (list(RequestStatus).index(self) >
-                list(RequestStatus).index(other))
+        return _STATUS_ORDER[self] > _STATUS_ORDER[other]
 
     def colored_str(self):
         color = _STATUS_TO_COLOR[self]
@@ -85,6 +91,9 @@ class RequestStatus(enum.Enum):
         return [cls.SUCCEEDED, cls.FAILED, cls.CANCELLED]
 
 
+# The position of each status in the definition order, used for comparisons.
+_STATUS_ORDER = {status: i for i, status in enumerate(RequestStatus)}
+
 _STATUS_TO_COLOR = {
     RequestStatus.PENDING: colorama.Fore.BLUE,
     RequestStatus.RUNNING: colorama.Fore.GREEN,
@@ -111,6 +120,65 @@ REQUEST_COLUMNS = [
     COL_FINISHED_AT,
     COL_FILE_MOUNTS_BLOB_ID,
 ]
+# Precomputed SQL fragments, so the statements on the hot paths are not
+# rebuilt on every call.
+_REQUEST_COLUMNS_STR = ', '.join(REQUEST_COLUMNS)
+_REQUEST_VALUES_STR = f'({", ".join(["?"] * len(REQUEST_COLUMNS))})'
+# JSON-serialized None, used as the placeholder for return values and errors
+# that are not set or not sent to the client.
+_JSON_NULL = orjson.dumps(None).decode('utf-8')
+
+
+class _RequestRow(NamedTuple):
+    """A row of the requests table, with the fields in REQUEST_COLUMNS order.
+
+    Used by Request.from_row to access the columns by name without building a
+    dict and validating a RequestPayload for every row read from the database.
+    """
+    request_id: str
+    name: str
+    # Pickled bytes, or base64-encoded pickle strings for the placeholders
+    # filled in by _update_request_row_fields.
+    entrypoint: Union[bytes, str]
+    request_body: Union[bytes, str]
+    status: str
+    return_value: str
+    error: str
+    pid: Optional[int]
+    created_at: float
+    cluster_name: Optional[str]
+    schedule_type: str
+    user_id: str
+    status_msg: Optional[str]
+    should_retry: bool
+    finished_at: Optional[float]
+    file_mounts_blob_id: Optional[str]
+
+
+assert list(_RequestRow._fields) == REQUEST_COLUMNS, _RequestRow._fields
+# The columns storing pickled objects. They are stored as raw bytes in the
+# database, and base64-encoded in the API payloads.
+_PICKLED_COLUMNS = ('entrypoint', 'request_body')
+
+
+def _unpickle(value: Union[bytes, str]) -> Any:
+    """Unpickle a value read from the database or from an API payload."""
+    if isinstance(value, bytes):
+        return pickle.loads(value)
+    return decoders.decode_and_unpickle(value)
+
+
+@annotations.lru_cache(scope='global', maxsize=1)
+def _get_log_path_prefix(log_path_prefix: str) -> str:
+    """Get the absolute request log directory, creating it on the first call.
+
+    Cached so that accessing Request.log_path does not stat or create the
+    directory every time. The cache is keyed on the configured prefix, and
+    must be cleared when the directory is removed.
+    """
+    path = os.path.abspath(os.path.expanduser(log_path_prefix))
+    os.makedirs(path, exist_ok=True)
+    return path
 
 
 class ScheduleType(enum.Enum):
@@ -149,11 +217,11 @@ class Request:
 
     @property
     def log_path(self) -> pathlib.Path:
-        log_path_prefix = pathlib.Path(
-            server_constants.REQUEST_LOG_PATH_PREFIX).expanduser().absolute()
-        log_path_prefix.mkdir(parents=True, exist_ok=True)
-        log_path = (log_path_prefix / self.request_id).with_suffix('.log')
-        return log_path
+        log_path_prefix = _get_log_path_prefix(
+            server_constants.REQUEST_LOG_PATH_PREFIX)
+        # Join as strings, so only one Path is constructed per access.
+        return pathlib.Path(
+            os.path.join(log_path_prefix, f'{self.request_id}.log'))
 
     def set_error(self, error: BaseException) -> None:
         """Set the error."""
@@ -188,15 +256,47 @@ class Request:
 
     @classmethod
     def from_row(cls, row: Tuple[Any, ...]) -> 'Request':
-        content = dict(zip(REQUEST_COLUMNS, row))
-        return cls.decode(payloads.RequestPayload(**content))
+        return cls.decode(_RequestRow._make(row))
 
     def to_row(self) -> Tuple[Any, ...]:
-        payload = self.encode()
-        row = []
-        for k in REQUEST_COLUMNS:
-            row.append(getattr(payload, k))
-        return tuple(row)
+        """Serialize the SkyPilot API request into a row of REQUEST_COLUMNS."""
+        assert isinstance(self.request_body,
+                          payloads.RequestBody), (self.name, self.request_body)
+        try:
+            # Use version-aware serializer to handle backward compatibility
+            # for old clients that don't recognize new fields.
+            serializer = return_value_serializers.get_serializer(self.name)
+            # Built directly in the order of REQUEST_COLUMNS, as this is called
+            # on every write to the database.
+            return (
+                self.request_id,
+                self.name,
+                encoders.pickle_object(self.entrypoint),
+                encoders.pickle_object(self.request_body),
+                self.status.value,
+                serializer(self.return_value),
+                orjson.dumps(self.error).decode('utf-8'),
+                self.pid,
+                self.created_at,
+                self.cluster_name,
+                self.schedule_type.value,
+                self.user_id,
+                self.status_msg,
+                self.should_retry,
+                self.finished_at,
+                self.file_mounts_blob_id,
+            )
+        except (TypeError, ValueError) as e:
+            # The error is unexpected, so we don't suppress the stack trace.
+            logger.error(
+                f'Error encoding: {e}\n'
+                f'  {self.request_id}\n'
+                f'  {self.name}\n'
+                f'  {self.request_body}\n'
+                f'  {self.return_value}\n'
+                f'  {self.created_at}\n',
+                exc_info=e)
+            raise
 
     def readable_encode(self) -> payloads.RequestPayload:
         """Serialize the SkyPilot API request for display purposes.
@@ -222,8 +322,8 @@ class Request:
             entrypoint=self.entrypoint.__name__,
             request_body=self.request_body.model_dump_json(),
             status=self.status.value,
-            return_value=orjson.dumps(None).decode('utf-8'),
-            error=orjson.dumps(None).decode('utf-8'),
+            return_value=_JSON_NULL,
+            error=_JSON_NULL,
             pid=None,
             created_at=self.created_at,
             schedule_type=self.schedule_type.value,
@@ -238,51 +338,22 @@ class Request:
 
     def encode(self) -> payloads.RequestPayload:
         """Serialize the SkyPilot API request."""
-        assert isinstance(self.request_body,
-                          payloads.RequestBody), (self.name, self.request_body)
-        try:
-            # Use version-aware serializer to handle backward compatibility
-            # for old clients that don't recognize new fields.
-            serializer = return_value_serializers.get_serializer(self.name)
-            return payloads.RequestPayload(
-                request_id=self.request_id,
-                name=self.name,
-                entrypoint=encoders.pickle_and_encode(self.entrypoint),
-                request_body=encoders.pickle_and_encode(self.request_body),
-                status=self.status.value,
-                return_value=serializer(self.return_value),
-                error=orjson.dumps(self.error).decode('utf-8'),
-                pid=self.pid,
-                created_at=self.created_at,
-                schedule_type=self.schedule_type.value,
-                user_id=self.user_id,
-                cluster_name=self.cluster_name,
-                status_msg=self.status_msg,
-                should_retry=self.should_retry,
-                finished_at=self.finished_at,
-                file_mounts_blob_id=self.file_mounts_blob_id,
-            )
-        except (TypeError, ValueError) as e:
-            # The error is unexpected, so we don't suppress the stack trace.
-            logger.error(
-                f'Error encoding: {e}\n'
-                f'  {self.request_id}\n'
-                f'  {self.name}\n'
-                f'  {self.request_body}\n'
-                f'  {self.return_value}\n'
-                f'  {self.created_at}\n',
-                exc_info=e)
-            raise
+        content = dict(zip(REQUEST_COLUMNS, self.to_row()))
+        for column in _PICKLED_COLUMNS:
+            content[column] = base64.b64encode(content[column]).decode('utf-8')
+        return payloads.RequestPayload(**content)
 
     @classmethod
-    def decode(cls, payload: payloads.RequestPayload) -> 'Request':
+    def decode(
+            cls, payload: Union[payloads.RequestPayload,
+                                _RequestRow]) -> 'Request':
         """Deserialize the SkyPilot API request."""
         try:
             return cls(
                 request_id=payload.request_id,
                 name=payload.name,
-                entrypoint=decoders.decode_and_unpickle(payload.entrypoint),
-                request_body=decoders.decode_and_unpickle(payload.request_body),
+                entrypoint=_unpickle(payload.entrypoint),
+                request_body=_unpickle(payload.request_body),
                 status=RequestStatus(payload.status),
                 return_value=orjson.loads(payload.return_value),
                 error=orjson.loads(payload.error),
@@ -292,7 +363,8 @@ class Request:
                 user_id=payload.user_id,
                 cluster_name=payload.cluster_name,
                 status_msg=payload.status_msg,
-                should_retry=payload.should_retry,
+                # Stored as an integer in the database.
+                should_retry=bool(payload.should_retry),
                 finished_at=payload.finished_at,
                 file_mounts_blob_id=payload.file_mounts_blob_id,
             )
@@ -301,8 +373,8 @@ class Request:
                 f'Error decoding: {e}\n'
                 f'  {payload.request_id}\n'
                 f'  {payload.name}\n'
-                f'  {payload.entrypoint}\n'
-                f'  {payload.request_body}\n'
+                f'  {payload.entrypoint!r}\n'
+                f'  {payload.request_body!r}\n'
                 f'  {payload.created_at}\n',
                 exc_info=e)
             # The error is unexpected, so we don't suppress the stack trace.
@@ -343,11 +415,10 @@ def encode_requests(requests: List[Request]) -> List[payloads.RequestPayload]:
             entrypoint=request.entrypoint.__name__
             if request.entrypoint is not None else '',
             request_body=request.request_body.model_dump_json()
-            if request.request_body is not None else
-            orjson.dumps(None).decode('utf-8'),
+            if request.request_body is not None else _JSON_NULL,
             status=request.status.value,
-            return_value=orjson.dumps(None).decode('utf-8'),
-            error=orjson.dumps(None).decode('utf-8'),
+            return_value=_JSON_NULL,
+            error=_JSON_NULL,
             pid=None,
             created_at=request.created_at,
             schedule_type=request.schedule_type.value,
@@ -388,9 +459,9 @@ def _update_request_row_fields(
     if 'user_id' not in fields:
         content['user_id'] = ''
     if 'return_value' not in fields:
-        content['return_value'] = orjson.dumps(None).decode('utf-8')
+        content['return_value'] = _JSON_NULL
     if 'error' not in fields:
-        content['error'] = orjson.dumps(None).decode('utf-8')
+        content['error'] = _JSON_NULL
     if 'schedule_type' not in fields:
         content['schedule_type'] = ScheduleType.SHORT.value
     # Optional fields in RequestPayload
@@ -411,6 +482,38 @@ def _update_request_row_fields(
     return tuple(content[col] for col in REQUEST_COLUMNS)
 
 
+def _set_connection_pragmas(cursor: sqlite3.Cursor) -> None:
+    """Tune a connection to the requests database.
+
+    These pragmas only apply to the connection they are run on, so this is
+    run on both the sync and the async connections of the SQLiteConn.
+    """
+    if common_utils.is_wsl():
+        # WAL is not enabled on WSL, see create_table.
+        return
+    # With WAL, synchronous=NORMAL only syncs the WAL file at checkpoints
+    # rather than on every commit. The database stays consistent across
+    # crashes, only the most recent commits may be rolled back after a
+    # power loss, which is acceptable for the request table.
+    # See: https://www.sqlite.org/pragma.html#pragma_synchronous
+    for pragma in (
+            'PRAGMA synchronous=NORMAL',
+            # 64 MiB page cache (negative values are in KiB).
+            'PRAGMA cache_size=-65536',
+            'PRAGMA temp_store=MEMORY',
+            # 256 MiB memory-mapped I/O.
+            'PRAGMA mmap_size=268435456',
+            'PRAGMA wal_autocheckpoint=1000',
+    ):
+        try:
+            cursor.execute(pragma)
+        except sqlite3.OperationalError as e:
+            if 'database is locked' not in str(e):
+                raise
+            # These pragmas only tune performance, it is OK to continue
+            # with the defaults.
+
+
 def create_table(cursor, conn):
     # Enable WAL mode to avoid locking issues.
     # See: issue #1441 and PR #1509
@@ -431,8 +534,8 @@ def create_table(cursor, conn):
         CREATE TABLE IF NOT EXISTS {REQUEST_TABLE} (
         request_id TEXT PRIMARY KEY,
         name TEXT,
-        entrypoint TEXT,
-        request_body TEXT,
+        entrypoint BLOB,
+        request_body BLOB,
         status TEXT,
         created_at REAL,
         return_value TEXT,
@@ -480,8 +583,12 @@ def _init_db_within_lock():
     if _DB is None:
         db_path = os.path.expanduser(
             server_constants.API_SERVER_REQUEST_DB_PATH)
-        pathlib.Path(db_path).parents[0].mkdir(parents=True, exist_ok=True)
-        _DB = db_utils.SQLiteConn(db_path, create_table)
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        _DB = db_utils.SQLiteConn(db_path,
+                                  create_table,
+                                  init_connection=_set_connection_pragmas)
+        # The cached requests were read from the previous database, if any.
+        _clear_request_cache()
 
 
 def _ensure_db_initialized():
@@ -496,6 +603,27 @@ def _ensure_db_initialized():
         _init_db_within_lock()
 
 
+@contextlib.contextmanager
+def _write_transaction() -> Generator[sqlite3.Cursor, None, None]:
+    """A write transaction on the thread-local connection.
+
+    The transaction is started with BEGIN IMMEDIATE, so the SQLite write lock
+    is taken upfront (waiting for the busy timeout if needed) instead of
+    upgrading a read transaction on the first write, which fails immediately
+    with 'database is locked' if another connection wrote in between. The
+    transaction is committed on exit, or rolled back on error.
+
+    The persistent cursor of the thread-local connection is reused instead of
+    creating a cursor per write. This is safe as write transactions cannot be
+    nested on the same connection.
+    """
+    assert _DB is not None
+    with _DB.conn:
+        cursor = _DB.cursor
+        cursor.execute('BEGIN IMMEDIATE')
+        yield cursor
+
+
 def init_db(func):
     """Initialize the database."""
 
@@ -536,6 +664,7 @@ def reset_db_and_logs():
     shutil.rmtree(pathlib.Path(
         server_constants.REQUEST_LOG_PATH_PREFIX).expanduser(),
                   ignore_errors=True)
+    _get_log_path_prefix.cache_clear()
     # Also clear legacy path for backward compatibility cleanup
     logger.debug('clearing legacy API server logs directory at '
                  f'{LEGACY_REQUEST_LOG_PATH_PREFIX}')
@@ -546,8 +675,7 @@ def reset_db_and_logs():
 
 
 def request_lock_path(request_id: str) -> str:
-    lock_path = os.path.expanduser(server_constants.REQUEST_LOG_PATH_PREFIX)
-    os.makedirs(lock_path, exist_ok=True)
+    lock_path = _get_log_path_prefix(server_constants.REQUEST_LOG_PATH_PREFIX)
     return os.path.join(lock_path, f'.{request_id}.lock')
 
 
@@ -658,24 +786,57 @@ async def update_status_msg_async(request_id: str, status_msg: str) -> None:
         request_id, status_msg)
 
 
+_get_request_sql = (f'SELECT {_REQUEST_COLUMNS_STR} FROM {REQUEST_TABLE} '
+                    'WHERE request_id LIKE ?')
+
+
+def _get_request_by_prefix_sql(fields: Optional[List[str]] = None) -> str:
+    """Get the SQL to select requests by request ID prefix."""
+    if not fields:
+        return _get_request_sql
+    return (f'SELECT {", ".join(fields)} FROM {REQUEST_TABLE} '
+            'WHERE request_id LIKE ?')
+
+
+def _get_request_with_cursor(
+        cursor: sqlite3.Cursor,
+        request_id: str,
+        fields: Optional[List[str]] = None) -> Optional[Request]:
+    """Get a SkyPilot API request within the cursor's transaction."""
+    cursor.execute(_get_request_by_prefix_sql(fields), (request_id + '%',))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    if fields:
+        row = _update_request_row_fields(row, fields)
+    return Request.from_row(row)
+
+
 def _get_request_no_lock(
         request_id: str,
         fields: Optional[List[str]] = None) -> Optional[Request]:
     """Get a SkyPilot API request."""
     assert _DB is not None
-    columns_str = ', '.join(REQUEST_COLUMNS)
-    if fields:
-        columns_str = ', '.join(fields)
     with _DB.conn:
         cursor = _DB.conn.cursor()
-        cursor.execute((f'SELECT {columns_str} FROM {REQUEST_TABLE} '
-                        'WHERE request_id LIKE ?'), (request_id + '%',))
-        row = cursor.fetchone()
-        if row is None:
-            return None
-    if fields:
-        row = _update_request_row_fields(row, fields)
-    return Request.from_row(row)
+        return _get_request_with_cursor(cursor, request_id, fields)
+
+
+def _requests_from_rows(rows: List[Any],
+                        fields: Optional[List[str]] = None) -> List[Request]:
+    """Decode the requests from the fetched rows of a query.
+
+    The rows should be fetched with fetchall() and decoded after the
+    statement is done, so that unpickling the requests does not keep the
+    read transaction, and hence the WAL snapshot, open. Each row is decoded
+    directly, without building an intermediate list of the selected fields.
+    """
+    requests = []
+    for row in rows:
+        if fields:
+            row = _update_request_row_fields(row, fields)
+        requests.append(Request.from_row(row))
+    return requests
 
 
 async def _get_request_no_lock_async(
@@ -683,12 +844,8 @@ async def _get_request_no_lock_async(
         fields: Optional[List[str]] = None) -> Optional[Request]:
     """Async version of _get_request_no_lock."""
     assert _DB is not None
-    columns_str = ', '.join(REQUEST_COLUMNS)
-    if fields:
-        columns_str = ', '.join(fields)
-    async with _DB.execute_fetchall_async(
-        (f'SELECT {columns_str} FROM {REQUEST_TABLE} '
-         'WHERE request_id LIKE ?'), (request_id + '%',)) as rows:
+    async with _DB.execute_fetchall_async(_get_request_by_prefix_sql(fields),
+                                          (request_id + '%',)) as rows:
         row = rows[0] if rows else None
         if row is None:
             return None
@@ -697,6 +854,115 @@ async def _get_request_no_lock_async(
     return Request.from_row(row)
 
 
+# Cache of finished requests read by their full request ID, so that repeated
+# reads of the same finished request (e.g., /api/get from multiple clients)
+# do not hit the database and unpickle the request again. Only finished
+# requests are cached, as the status of unfinished requests is polled for
+# changes made by the executor processes, where the cache cannot be
+# invalidated. The TTL bounds the staleness of the rare updates of finished
+# requests from other processes (e.g., rescheduling a request that failed
+# because of a broken process pool). The entries are kept in the order they
+# were cached, so that expired entries are purged from the front on every
+# insert, and the cache is capped to a few entries, as it only needs to hold
+# the requests read repeatedly within the TTL.
+_REQUEST_CACHE_TTL_SECONDS = 1.0
+_REQUEST_CACHE_MAX_SIZE = 32
+_request_cache: 'collections.OrderedDict[str, Tuple[float, Request]]' = (
+    collections.OrderedDict())
+_request_cache_lock = threading.Lock()
+# A read that started before a write of the same request can finish after
+# the write invalidated the cache, so it must not cache what it read. To
+# detect this, every invalidation gets a new generation from a counter, and
+# the generation of the latest invalidation of each request is tracked,
+# for up to _REQUEST_CACHE_MAX_INVALIDATIONS requests. A read only caches the
+# request if it was not invalidated after the generation at which the read
+# started. When the generation of a request is evicted from the tracking,
+# reads started before it conservatively do not cache anything.
+_REQUEST_CACHE_MAX_INVALIDATIONS = 1024
+_request_cache_generation = 0
+_request_cache_invalidations: 'collections.OrderedDict[str, int]' = (
+    collections.OrderedDict())
+_request_cache_evicted_generation = 0
+
+
+def _get_cached_request(request_id: str) -> Optional[Request]:
+    """Get a copy of the cached request, or None if not cached."""
+    with _request_cache_lock:
+        entry = _request_cache.get(request_id)
+        if entry is None:
+            return None
+        cached_at, request = entry
+        if time.monotonic() - cached_at > _REQUEST_CACHE_TTL_SECONDS:
+            del _request_cache[request_id]
+            return None
+    # Return a copy, so callers modifying the request do not modify the cache.
+    return copy.copy(request)
+
+
+def _get_request_cache_generation() -> int:
+    """Get the generation to pass to _cache_request, before the read."""
+    with _request_cache_lock:
+        return _request_cache_generation
+
+
+def _cache_request(request_id: str, request: Optional[Request],
+                   generation: int) -> None:
+    """Cache the request read by request_id, if it is finished.
+
+    Args:
+        request_id: the request ID the request was read by.
+        request: the request read from the database.
+        generation: the result of _get_request_cache_generation() before the
+            request was read.
+    """
+    # request_id can be a prefix of the ID of the request read.
+    if (request is None or request.request_id != request_id or
+            request.status not in RequestStatus.finished_status()):
+        return
+    with _request_cache_lock:
+        if (_request_cache_evicted_generation > generation or
+                _request_cache_invalidations.get(request_id, 0) > generation):
+            # The request may have been written since it was read.
+            return
+        now = time.monotonic()
+        # Re-insert the request at the end, to keep the entries ordered by
+        # the time they were cached.
+        _request_cache.pop(request_id, None)
+        _request_cache[request_id] = (now, copy.copy(request))
+        while _request_cache:
+            cached_at, _ = next(iter(_request_cache.values()))
+            if (len(_request_cache) <= _REQUEST_CACHE_MAX_SIZE and
+                    now - cached_at <= _REQUEST_CACHE_TTL_SECONDS):
+                break
+            _request_cache.popitem(last=False)
+
+
+def _clear_request_cache() -> None:
+    global _request_cache_generation, _request_cache_evicted_generation
+    with _request_cache_lock:
+        _request_cache.clear()
+        _request_cache_invalidations.clear()
+        # Reads in flight must not cache requests read before the clear.
+        _request_cache_generation += 1
+        _request_cache_evicted_generation = _request_cache_generation
+
+
+def _invalidate_cached_requests(request_ids: List[str]) -> None:
+    """Remove the requests from the cache, after they are written."""
+    global _request_cache_generation, _request_cache_evicted_generation
+    with _request_cache_lock:
+        for request_id in request_ids:
+            _request_cache.pop(request_id, None)
+            _request_cache_generation += 1
+            _request_cache_invalidations[request_id] = _request_cache_generation
+            _request_cache_invalidations.move_to_end(request_id)
+        while (len(_request_cache_invalidations) >
+               _REQUEST_CACHE_MAX_INVALIDATIONS):
+            _, evicted_generation = _request_cache_invalidations.popitem(
+                last=False)
+            _request_cache_evicted_generation = evicted_generation
+
+
 @metrics_lib.time_me
 async def get_latest_request_id_async() -> Optional[str]:
     """Get the latest request ID."""
@@ -859,7 +1125,7 @@ class RequestTaskFilter:
         filter_str = ' AND '.join(filters)
         if filter_str:
             filter_str = f' WHERE {filter_str}'
-        columns_str = ', '.join(REQUEST_COLUMNS)
+        columns_str = _REQUEST_COLUMNS_STR
         if self.fields:
             columns_str = ', '.join(self.fields)
         sort_str = ''
@@ -905,29 +1171,56 @@ def get_active_file_mounts_blob_ids() -> set:
 
 
 _add_or_update_request_sql = (f'INSERT OR REPLACE INTO {REQUEST_TABLE} '
-                              f'({", ".join(REQUEST_COLUMNS)}) VALUES '
-                              f'({", ".join(["?"] * len(REQUEST_COLUMNS))})')
+                              f'({_REQUEST_COLUMNS_STR}) VALUES '
+                              f'{_REQUEST_VALUES_STR}')
+_create_if_not_exists_sql = (f'INSERT INTO {REQUEST_TABLE} '
+                             f'({_REQUEST_COLUMNS_STR}) VALUES '
+                             f'{_REQUEST_VALUES_STR} '
+                             'ON CONFLICT(request_id) DO NOTHING '
+                             'RETURNING ROWID')
+# SQLite limits the number of host parameters in a single statement (999 for
+# versions before 3.32.0), so a batch write is split into multi-row INSERTs
+# that stay under the limit.
+_SQLITE_MAX_VARIABLES = 999
+_ADD_OR_UPDATE_BATCH_SIZE = _SQLITE_MAX_VARIABLES // len(REQUEST_COLUMNS)
 
 
-def _add_or_update_request_no_lock(request: Request):
-    """Add or update a REST request into the database."""
+def _get_add_or_update_requests_sql(num_requests: int) -> str:
+    """Get the SQL to add or update num_requests requests at once."""
+    values_str = ', '.join([_REQUEST_VALUES_STR] * num_requests)
+    return (f'INSERT OR REPLACE INTO {REQUEST_TABLE} '
+            f'({_REQUEST_COLUMNS_STR}) VALUES {values_str}')
+
+
+_add_or_update_requests_batch_sql = _get_add_or_update_requests_sql(
+    _ADD_OR_UPDATE_BATCH_SIZE)
+
+
+def _add_or_update_requests_no_lock(requests: List[Request]):
+    """Add or update a batch of REST requests in a single transaction."""
     assert _DB is not None
-    if sky_logging.logging_enabled(logger, sky_logging.DEBUG):
-        logger.debug(f'Start adding or updating request {request.request_id}')
-    try:
-        with _DB.conn:
-            cursor = _DB.conn.cursor()
-            cursor.execute(_add_or_update_request_sql, request.to_row())
-    finally:
-        if sky_logging.logging_enabled(logger, sky_logging.DEBUG):
-            logger.debug(f'End adding or updating request {request.request_id}')
+    if not requests:
+        return
+    rows = [request.to_row() for request in requests]
+    # Write the whole batch in one transaction, so it is committed (and
+    # synced to disk) once, instead of once per request.
+    with _write_transaction() as cursor:
+        for i in range(0, len(rows), _ADD_OR_UPDATE_BATCH_SIZE):
+            batch = rows[i:i + _ADD_OR_UPDATE_BATCH_SIZE]
+            if len(batch) == _ADD_OR_UPDATE_BATCH_SIZE:
+                sql = _add_or_update_requests_batch_sql
+            else:
+                sql = _get_add_or_update_requests_sql(len(batch))
+            cursor.execute(sql, list(itertools.chain.from_iterable(batch)))
+    _invalidate_cached_requests([request.request_id for request in requests])
 
 
 async def _add_or_update_request_no_lock_async(request: Request):
-    """Async version of _add_or_update_request_no_lock."""
+    """Add or update a REST request into the database."""
     assert _DB is not None
     await _DB.execute_and_commit_async(_add_or_update_request_sql,
                                        request.to_row())
+    _invalidate_cached_requests([request.request_id])
 
 
 def set_exception_stacktrace(e: BaseException) -> None:
@@ -1138,12 +1431,23 @@ atexit.register(_cleanup)
 class SqliteRequestBackend(request_storage.RequestBackend):
     """SQLite-based request backend."""
 
+    # Reads do not take the per-request file lock: a request row is always
+    # written as a whole in a single transaction, and in WAL mode readers see
+    # the last committed snapshot without blocking (or being blocked by)
+    # writers. The file lock is only needed to serialize read-modify-write
+    # updates of the same request across processes.
     @init_db
     def get_request(self,
                     request_id: str,
                     fields: Optional[List[str]] = None) -> Optional[Request]:
-        with filelock.FileLock(request_lock_path(request_id)):
+        if fields:
             return _get_request_no_lock(request_id, fields)
+        request = _get_cached_request(request_id)
+        if request is None:
+            generation = _get_request_cache_generation()
+            request = _get_request_no_lock(request_id)
+            _cache_request(request_id, request, generation)
+        return request
 
     @init_db_async
     @asyncio_utils.shield
@@ -1151,18 +1455,32 @@ class SqliteRequestBackend(request_storage.RequestBackend):
             self,
             request_id: str,
             fields: Optional[List[str]] = None) -> Optional[Request]:
-        async with filelock.AsyncFileLock(request_lock_path(request_id)):
+        if fields:
             return await _get_request_no_lock_async(request_id, fields)
+        request = _get_cached_request(request_id)
+        if request is None:
+            generation = _get_request_cache_generation()
+            request = await _get_request_no_lock_async(request_id)
+            _cache_request(request_id, request, generation)
+        return request
 
     @contextlib.contextmanager
     def update_request(
             self, request_id: str) -> Generator[Optional[Request], None, None]:
         _ensure_db_initialized()
+        # The file lock serializes this with the async read-modify-write
+        # paths, which cannot hold a SQLite transaction across awaits.
         with filelock.FileLock(request_lock_path(request_id)):
-            request = _get_request_no_lock(request_id)
-            yield request
+            # Read and write back the request in a single transaction, so the
+            # update is committed once and no other writer can modify the
+            # request in between.
+            with _write_transaction() as cursor:
+                request = _get_request_with_cursor(cursor, request_id)
+                yield request
+                if request is not None:
+                    cursor.execute(_add_or_update_request_sql, request.to_row())
             if request is not None:
-                _add_or_update_request_no_lock(request)
+                _invalidate_cached_requests([request.request_id])
 
     @contextlib.asynccontextmanager
     async def update_request_async(self, request_id: str):
@@ -1177,23 +1495,27 @@ class SqliteRequestBackend(request_storage.RequestBackend):
     @asyncio_utils.shield
     async def create_if_not_exists_async(self, request: Request) -> bool:
         assert _DB is not None
-        request_columns = ', '.join(REQUEST_COLUMNS)
-        values_str = ', '.join(['?'] * len(REQUEST_COLUMNS))
-        sql_statement = (f'INSERT INTO {REQUEST_TABLE} '
-                         f'({request_columns}) VALUES '
-                         f'({values_str}) ON CONFLICT(request_id) DO NOTHING '
-                         f'RETURNING ROWID')
         request_row = request.to_row()
         if sky_logging.logging_enabled(logger, sky_logging.DEBUG):
             logger.debug(f'Start creating request {request.request_id}')
         try:
             row = await _DB.execute_get_returning_value_async(
-                sql_statement, request_row)
+                _create_if_not_exists_sql, request_row)
         finally:
             if sky_logging.logging_enabled(logger, sky_logging.DEBUG):
                 logger.debug(f'End creating request {request.request_id}')
         return True if row else False
 
+    @init_db
+    def add_or_update_requests(self, requests: List[Request]) -> None:
+        """Add or update a batch of requests in a single transaction.
+
+        This is specific to the SQLite backend and not part of the
+        RequestBackend interface, so that other backends do not have to
+        implement it until there is a caller of it.
+        """
+        _add_or_update_requests_no_lock(requests)
+
     @init_db
     def query_requests(self, req_filter: RequestTaskFilter) -> List[Request]:
         assert _DB is not None
@@ -1201,14 +1523,7 @@ class SqliteRequestBackend(request_storage.RequestBackend):
             cursor = _DB.conn.cursor()
             cursor.execute(*req_filter.build_query())
             rows = cursor.fetchall()
-            if rows is None:
-                return []
-        if req_filter.fields:
-            rows = [
-                _update_request_row_fields(row, req_filter.fields)
-                for row in rows
-            ]
-        return [Request.from_row(row) for row in rows]
+        return _requests_from_rows(rows, req_filter.fields)
 
     @init_db_async
     async def query_requests_async(
@@ -1238,6 +1553,7 @@ class SqliteRequestBackend(request_storage.RequestBackend):
             await _DB.execute_and_commit_async(
                 f'DELETE FROM {REQUEST_TABLE} '
                 f'WHERE request_id IN ({id_list_str})')
+            _invalidate_cached_requests(request_ids)
         finally:
             if sky_logging.logging_enabled(logger, sky_logging.DEBUG):
                 logger.debug(f'End deleting requests {request_ids}')
@@ -1324,21 +1640,14 @@ class SqliteRequestBackend(request_storage.RequestBackend):
             request_id_prefix: str,
             fields: Optional[List[str]] = None) -> Optional[List[Request]]:
         assert _DB is not None
-        if fields:
-            columns_str = ', '.join(fields)
-        else:
-            columns_str = ', '.join(REQUEST_COLUMNS)
         with _DB.conn:
             cursor = _DB.conn.cursor()
-            cursor.execute((f'SELECT {columns_str} FROM {REQUEST_TABLE} '
-                            'WHERE request_id LIKE ?'),
+            cursor.execute(_get_request_by_prefix_sql(fields),
                            (request_id_prefix + '%',))
             rows = cursor.fetchall()
-            if not rows:
-                return None
-            if fields:
-                rows = [_update_request_row_fields(row, fields) for row in rows]
-            return [Request.from_row(row) for row in rows]
+        if not rows:
+            return None
+        return _requests_from_rows(rows, fields)
 
     @init_db_async
     @asyncio_utils.shield
@@ -1347,13 +1656,9 @@ class SqliteRequestBackend(request_storage.RequestBackend):
             request_id_prefix: str,
             fields: Optional[List[str]] = None) -> Optional[List[Request]]:
         assert _DB is not None
-        if fields:
-            columns_str = ', '.join(fields)
-        else:
-            columns_str = ', '.join(REQUEST_COLUMNS)
+        sql = _get_request_by_prefix_sql(fields)
         async with _DB.execute_fetchall_async(
-            (f'SELECT {columns_str} FROM {REQUEST_TABLE} '
-             'WHERE request_id LIKE ?'), (request_id_prefix + '%',)) as rows:
+                sql, (request_id_prefix + '%',)) as rows:
             if not rows:
                 return None
             if fields:
@@ -1427,6 +1732,7 @@ class SqliteRequestBackend(request_storage.RequestBackend):
     def reset_on_startup(self) -> None:
         with _init_db_lock:
             _init_db_within_lock()
+        _clear_request_cache()
         assert _DB is not None
         with _DB.conn:
             cursor = _DB.conn.cursor()
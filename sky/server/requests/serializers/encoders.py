@@ -22,16 +22,21 @@ if typing.TYPE_CHECKING:
 handlers: Dict[str, Any] = {}
 
 
-def pickle_and_encode(obj: Any) -> str:
+def pickle_object(obj: Any) -> bytes:
+    """Pickle an object, e.g., to store it in a database BLOB column."""
     try:
         # Apply backwards compatibility processing at the lowest level
         # to catch any handles that might have bypassed the encoders
         obj = serialize_utils.prepare_handle_for_backwards_compatibility(obj)
-        return base64.b64encode(pickle.dumps(obj)).decode('utf-8')
+        return pickle.dumps(obj)
     except TypeError as e:
         raise ValueError(f'Failed to pickle object: {obj}') from e
 
 
+def pickle_and_encode(obj: Any) -> str:
+    return base64.b64encode(pickle_object(obj)).decode('utf-8')
+
+
 def encode_handle(handle: Any) -> Any:
     """Encode a ResourceHandle for the REST API response.
 
@@ -2190,8 +2190,9 @@ async def api_get(request_id: str) -> payloads.RequestPayload:
     if request_task.should_retry:
         raise fastapi.HTTPException(
             status_code=503, detail=f'Request {request_id!r} should be retried')
-    request_error = request_task.get_error()
-    if request_error is not None:
+    # Check the raw error instead of get_error(), which unpickles and
+    # reconstructs the exception object that is only used on the client side.
+    if request_task.error is not None:
         raise fastapi.HTTPException(status_code=500,
                                     detail=request_task.encode().model_dump())
     return request_task.encode()
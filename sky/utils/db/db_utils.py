@@ -304,14 +304,30 @@ def fault_point():
 
 
 class SQLiteConn(threading.local):
-    """Thread-local connection to the sqlite3 database."""
+    """Thread-local connection to the sqlite3 database.
 
-    def __init__(self, db_path: str, create_table: Callable):
+    Args:
+        db_path: the path to the database.
+        create_table: called with the cursor and connection of the sync
+            connection to create the tables.
+        init_connection: if provided, called with a cursor of every connection
+            opened, including the async connection, to apply per-connection
+            settings such as PRAGMAs.
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 create_table: Callable,
+                 init_connection: Optional[Callable[[sqlite3.Cursor],
+                                                    None]] = None):
         super().__init__()
         self.db_path = db_path
+        self._init_connection = init_connection
         self.conn = sqlite3.connect(db_path, timeout=_DB_TIMEOUT_S)
         self.cursor = self.conn.cursor()
         create_table(self.cursor, self.conn)
+        if init_connection is not None:
+            init_connection(self.cursor)
         self._async_conn: Optional[aiosqlite.Connection] = None
         self._async_conn_lock: Optional[asyncio.Lock] = None
 
@@ -346,8 +362,27 @@ class SQLiteConn(threading.local):
                 if self._async_conn is None:
                     # Init logic like requests.init_db_within_lock will handle
                     # initialization like setting the WAL mode, so we do not
-                    # duplicate that logic here.
-                    self._async_conn = await aiosqlite.connect(self.db_path)
+                    # duplicate that logic here. Settings that only apply to
+                    # the connection they are set on still need to be applied
+                    # to this connection with init_connection.
+                    conn = await aiosqlite.connect(self.db_path)
+                    if self._init_connection is not None:
+                        init_connection = self._init_connection
+
+                        def init_async_conn():
+                            # pylint: disable=protected-access
+                            with safe_cursor_on_connection(
+                                    conn._conn) as cursor:
+                                init_connection(cursor)
+
+                        try:
+                            # pylint: disable=protected-access
+                            await conn._execute(init_async_conn)
+                        except BaseException:
+                            # Do not leak the connection and its thread.
+                            await conn.close()
+                            raise
+                    self._async_conn = conn
         return self._async_conn
 
     async def execute_and_commit_async(self,
@@ -132,6 +132,7 @@ def mock_request_obj():
     obj.request_id = 'test_req_0000'
     obj.status = requests_lib.RequestStatus.SUCCEEDED
     obj.should_retry = False
+    obj.error = None
     obj.get_error = lambda: None
     obj.encode = lambda: mock.MagicMock(model_dump=lambda: {})
     obj.readable_encode = lambda: {}
@@ -0,0 +1,155 @@
+"""Unit tests for Azure adaptor."""
+
+import concurrent.futures
+import sys
+import threading
+import time
+import unittest.mock as mock
+
+import pytest
+
+from sky.adaptors import azure
+
+
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    azure.get_client.cache_clear()
+    azure._private_container_urls.clear()
+    yield
+    azure.get_client.cache_clear()
+    azure._private_container_urls.clear()
+
+
+class TestGetClient:
+    """Test azure.get_client() caching."""
+
+    def test_get_client_caches_by_arguments(self):
+        with mock.patch.object(
+                azure,
+                '_create_client',
+                side_effect=lambda *args, **kwargs: object()) as mock_create:
+            compute_client = azure.get_client('compute', 'sub-1')
+            assert azure.get_client('compute', 'sub-1') is compute_client
+            assert azure.get_client('compute', 'sub-2') is not compute_client
+            assert azure.get_client('network', 'sub-1') is not compute_client
+            container_client = azure.get_client('container',
+                                                'sub-1',
+                                                container_url='url',
+                                                storage_account_name='acct')
+            assert azure.get_client('container',
+                                    'sub-1',
+                                    storage_account_name='acct',
+                                    container_url='url') is container_client
+            assert mock_create.call_count == 4
+
+            azure.get_client.cache_clear()
+            assert azure.get_client('compute', 'sub-1') is not compute_client
+            assert mock_create.call_count == 5
+
+    def test_get_client_concurrent_misses_create_once(self):
+        num_threads = 8
+        barrier = threading.Barrier(num_threads)
+
+        def slow_create(*args, **kwargs):
+            del args, kwargs
+            time.sleep(0.1)
+            return object()
+
+        def get_client():
+            barrier.wait()
+            return azure.get_client('compute', 'sub-1')
+
+        with mock.patch.object(azure, '_create_client',
+                               side_effect=slow_create) as mock_create:
+            with concurrent.futures.ThreadPoolExecutor(num_threads) as pool:
+                clients = list(
+                    pool.map(lambda _: get_client(), range(num_threads)))
+            assert mock_create.call_count == 1
+            assert all(client is clients[0] for client in clients)
+
+    @mock.patch.object(azure,
+                       '_create_client',
+                       side_effect=lambda *args, **kwargs: object())
+    @mock.patch.object(azure, '_CLIENT_CACHE_MAX_SIZE', 2)
+    def test_get_client_cache_is_bounded(self, mock_create):
+        client_1 = azure.get_client('compute', 'sub-1')
+        azure.get_client('compute', 'sub-2')
+        # Accessing sub-1 makes sub-2 the least recently used client.
+        assert azure.get_client('compute', 'sub-1') is client_1
+        azure.get_client('compute', 'sub-3')
+        assert len(azure._client_cache) == 2
+        assert azure.get_client('compute', 'sub-1') is client_1
+        assert mock_create.call_count == 3
+        azure.get_client('compute', 'sub-2')
+        assert mock_create.call_count == 4
+        # The per-key locks are only kept while creating the client.
+        assert not azure._client_key_locks
+
+    def test_get_client_not_cached_if_cleared_while_creating(self):
+
+        def create_and_clear(*args, **kwargs):
+            del args, kwargs
+            azure.get_client.cache_clear()
+            return object()
+
+        with mock.patch.object(azure,
+                               '_create_client',
+                               side_effect=create_and_clear) as mock_create:
+            client = azure.get_client('compute', 'sub-1')
+            assert azure.get_client('compute', 'sub-1') is not client
+            assert mock_create.call_count == 2
+
+    @mock.patch('azure.mgmt.network.NetworkManagementClient')
+    @mock.patch('azure.mgmt.compute.ComputeManagementClient')
+    @mock.patch('azure.identity.AzureCliCredential')
+    def test_get_client_shares_credential(self, mock_cred, mock_compute,
+                                          mock_network):
+        azure.get_client('compute', 'sub-1')
+        azure.get_client('network', 'sub-1')
+        mock_cred.assert_called_once_with(process_timeout=30)
+        credential = mock_cred.return_value
+        mock_compute.assert_called_once_with(credential, 'sub-1')
+        mock_network.assert_called_once_with(credential, 'sub-1')
+
+        # Clearing the cache also drops the shared credential.
+        azure.get_client.cache_clear()
+        azure.get_client('compute', 'sub-1')
+        assert mock_cred.call_count == 2
+
+
+class TestGetContainerClient:
+    """Test azure.get_client('container')."""
+
+    def test_private_container_skips_anonymous_check(self):
+        mock_storage = mock.MagicMock()
+        (mock_storage.StorageManagementClient.return_value.storage_accounts.
+         check_name_availability.return_value.name_available) = False
+        mock_blob = mock.MagicMock()
+        anonymous_client = mock.MagicMock()
+        anonymous_client.exists.side_effect = (
+            azure.exceptions().ClientAuthenticationError('private'))
+        private_client = mock.MagicMock()
+
+        def from_container_url(url, credential=None):
+            del url
+            return anonymous_client if credential is None else private_client
+
+        mock_blob.ContainerClient.from_container_url.side_effect = (
+            from_container_url)
+        mock_azure_storage = mock.MagicMock(blob=mock_blob)
+        with mock.patch.dict(
+                sys.modules, {
+                    'azure.mgmt.storage': mock_storage,
+                    'azure.storage': mock_azure_storage,
+                    'azure.storage.blob': mock_blob,
+                }), mock.patch('azure.identity.AzureCliCredential'):
+            for _ in range(2):
+                client = azure.get_client('container',
+                                          'sub-1',
+                                          container_url='url',
+                                          storage_account_name='acct')
+                assert client is private_client
+                azure.get_client.cache_clear()
+        # The anonymous check is only done the first time.
+        assert anonymous_client.exists.call_count == 1
+        assert private_client.exists.call_count == 2
@@ -0,0 +1,41 @@
+"""Unit tests for sky.adaptors.common."""
+
+import threading
+
+from sky.adaptors import common
+
+
+def test_lazy_import_waits_for_set_loggers():
+    """Other threads do not get the module before set_loggers is done."""
+    in_set_loggers = threading.Event()
+    finish_set_loggers = threading.Event()
+    calls = []
+
+    def set_loggers():
+        in_set_loggers.set()
+        finish_set_loggers.wait()
+        calls.append('set_loggers')
+
+    lazy_module = common.LazyImport('json', set_loggers=set_loggers)
+    first = threading.Thread(target=lazy_module.load_module)
+    first.start()
+    assert in_set_loggers.wait(timeout=10)
+
+    def load_module():
+        lazy_module.load_module()
+        calls.append('load_module')
+
+    second = threading.Thread(target=load_module)
+    second.start()
+    second.join(timeout=0.2)
+    # The second thread is blocked until set_loggers returns.
+    assert second.is_alive()
+    assert not calls
+
+    finish_set_loggers.set()
+    first.join()
+    second.join()
+    assert calls == ['set_loggers', 'load_module']
+    # Loaded modules are returned without calling set_loggers again.
+    assert lazy_module.load_module().__name__ == 'json'
+    assert calls == ['set_loggers', 'load_module']
@@ -1,6 +1,8 @@
 """Unit tests for sky.server.requests.requests module."""
 import asyncio
+import copy
 import logging
+import os
 import pathlib
 import time
 from typing import List, Optional
@@ -1838,3 +1840,301 @@ async def test_get_requests_with_prefix(isolated_database, test_async):
         assert req.finished_at is None
         assert req.should_retry is False
         assert req.status_msg is None
+
+
+def test_add_or_update_requests(isolated_database):
+    """Test adding and updating requests in batches."""
+    current_time = time.time()
+    # More than one multi-row INSERT is needed to write all the requests.
+    num_requests = requests._ADD_OR_UPDATE_BATCH_SIZE * 2 + 1
+    batch = [
+        requests.Request(request_id=f'batch-add-{i:03d}',
+                         name='test-request',
+                         entrypoint=dummy,
+                         request_body=payloads.RequestBody(),
+                         status=RequestStatus.PENDING,
+                         created_at=current_time + i,
+                         user_id='test-user') for i in range(num_requests)
+    ]
+    requests.SqliteRequestBackend().add_or_update_requests([])
+    requests.SqliteRequestBackend().add_or_update_requests(batch)
+
+    result = requests.get_requests_with_prefix('batch-add-')
+    assert result is not None
+    assert len(result) == num_requests
+
+    # Existing requests are overwritten.
+    for request in batch[:2]:
+        request.status = RequestStatus.SUCCEEDED
+    requests.SqliteRequestBackend().add_or_update_requests(batch[:2])
+    result = requests.get_request_tasks(req_filter=requests.RequestTaskFilter(
+        status=[RequestStatus.SUCCEEDED]))
+    assert {r.request_id for r in result} == {'batch-add-000', 'batch-add-001'}
+    assert len(requests.get_requests_with_prefix('batch-add-')) == num_requests
+
+
+@pytest.mark.asyncio
+async def test_get_request_does_not_create_lock_file(isolated_database):
+    """Test that reading a request does not take the per-request file lock."""
+    request = requests.Request(request_id='test-request-no-lock',
+                               name='test-request',
+                               entrypoint=dummy,
+                               request_body=payloads.RequestBody(),
+                               status=RequestStatus.PENDING,
+                               created_at=time.time(),
+                               user_id='test-user')
+    await requests.create_if_not_exists_async(request)
+
+    assert requests.get_request('test-request-no-lock') is not None
+    assert await requests.get_request_async('test-request-no-lock') is not None
+    lock_path = pathlib.Path(requests.request_lock_path('test-request-no-lock'))
+    assert not lock_path.exists()
+
+
+def test_update_request_single_transaction(isolated_database):
+    """Test that update_request reads and writes in one transaction."""
+    request = requests.Request(request_id='test-request-update',
+                               name='test-request',
+                               entrypoint=dummy,
+                               request_body=payloads.RequestBody(),
+                               status=RequestStatus.PENDING,
+                               created_at=time.time(),
+                               user_id='test-user')
+    requests.SqliteRequestBackend().add_or_update_requests([request])
+
+    with requests.update_request('test-request-update') as request_task:
+        assert request_task is not None
+        # The transaction holds the write lock until the update is committed.
+        assert requests._DB.conn.in_transaction
+        request_task.status = RequestStatus.RUNNING
+    assert not requests._DB.conn.in_transaction
+    assert requests.get_request(
+        'test-request-update').status == RequestStatus.RUNNING
+
+    # The update is rolled back if the body raises.
+    with pytest.raises(ValueError):
+        with requests.update_request('test-request-update') as request_task:
+            assert request_task is not None
+            request_task.status = RequestStatus.SUCCEEDED
+            raise ValueError('test')
+    assert requests.get_request(
+        'test-request-update').status == RequestStatus.RUNNING
+
+    with requests.update_request('nonexistent-request') as request_task:
+        assert request_task is None
+
+
+def test_log_path_creates_directory_once(isolated_database, tmp_path):
+    """Test that the log directory is only created on the first access."""
+    request = requests.Request(request_id='test-request-log-path',
+                               name='test-request',
+                               entrypoint=dummy,
+                               request_body=payloads.RequestBody(),
+                               status=RequestStatus.PENDING,
+                               created_at=time.time(),
+                               user_id='test-user')
+    requests._get_log_path_prefix.cache_clear()
+    with mock.patch('os.makedirs', wraps=os.makedirs) as mock_makedirs:
+        log_path = request.log_path
+        assert request.log_path == log_path
+        assert mock_makedirs.call_count == 1
+    assert log_path.parent.is_dir()
+    assert log_path == tmp_path / 'logs' / 'test-request-log-path.log'
+
+
+def test_request_row_round_trip():
+    """Test Request.to_row and Request.from_row are inverses."""
+    request = requests.Request(request_id='test-row-round-trip',
+                               name='test-request',
+                               entrypoint=dummy,
+                               request_body=payloads.RequestBody(),
+                               status=RequestStatus.FAILED,
+                               created_at=time.time(),
+                               user_id='test-user',
+                               pid=1234,
+                               schedule_type=requests.ScheduleType.SHORT,
+                               cluster_name='test-cluster',
+                               status_msg='test-msg',
+                               should_retry=True,
+                               finished_at=time.time(),
+                               file_mounts_blob_id='test-blob')
+    request.set_error(ValueError('test error'))
+    row = request.to_row()
+    assert len(row) == len(requests.REQUEST_COLUMNS)
+    decoded = requests.Request.from_row(row)
+    assert decoded.request_body == request.request_body
+    decoded.request_body = request.request_body
+    assert decoded == request
+
+    # Booleans are stored as integers in the database.
+    row = list(row)
+    row[requests.REQUEST_COLUMNS.index('should_retry')] = 0
+    assert requests.Request.from_row(tuple(row)).should_retry is False
+
+    # Pickled objects are stored as raw bytes, but base64-encoded in the API
+    # payload.
+    entrypoint_index = requests.REQUEST_COLUMNS.index('entrypoint')
+    assert isinstance(row[entrypoint_index], bytes)
+    payload = request.encode()
+    assert isinstance(payload.entrypoint, str)
+    decoded = requests.Request.decode(payload)
+    assert decoded.entrypoint is dummy
+    assert decoded.request_body == request.request_body
+
+
+def test_request_status_ordering():
+    """Test RequestStatus compares by definition order."""
+    assert RequestStatus.PENDING < RequestStatus.RUNNING
+    assert RequestStatus.SUCCEEDED > RequestStatus.RUNNING
+    assert RequestStatus.RUNNING >= RequestStatus.RUNNING
+    assert RequestStatus.RUNNING <= RequestStatus.RUNNING
+    assert not RequestStatus.RUNNING > RequestStatus.RUNNING
+    assert all(status > RequestStatus.RUNNING
+               for status in RequestStatus.finished_status())
+    assert sorted(RequestStatus, reverse=True) == list(RequestStatus)[::-1]
+
+
+@pytest.mark.asyncio
+async def test_get_request_caches_finished_requests(isolated_database):
+    """Test that only finished requests are served from the cache."""
+    statuses = {
+        'test-cache-pending': RequestStatus.PENDING,
+        'test-cache-done': RequestStatus.SUCCEEDED,
+    }
+    requests.SqliteRequestBackend().add_or_update_requests([
+        requests.Request(request_id=request_id,
+                         name='test-request',
+                         entrypoint=dummy,
+                         request_body=payloads.RequestBody(),
+                         status=status,
+                         created_at=time.time(),
+                         user_id='test-user')
+        for request_id, status in statuses.items()
+    ])
+
+    with mock.patch.object(
+            requests, '_get_request_no_lock',
+            wraps=requests._get_request_no_lock) as mock_get, mock.patch.object(
+                requests,
+                '_get_request_no_lock_async',
+                wraps=requests._get_request_no_lock_async) as mock_get_async:
+        for _ in range(2):
+            assert requests.get_request(
+                'test-cache-pending').status == RequestStatus.PENDING
+            assert requests.get_request(
+                'test-cache-done').status == RequestStatus.SUCCEEDED
+            assert (await requests.get_request_async('test-cache-done')
+                   ).status == RequestStatus.SUCCEEDED
+        assert mock_get.call_count == 3
+        assert mock_get_async.call_count == 0
+
+        # Modifying the returned request does not modify the cache.
+        requests.get_request('test-cache-done').status_msg = 'modified'
+        assert requests.get_request('test-cache-done').status_msg is None
+        # Requests read by a prefix of their ID or with fields are not cached.
+        requests.get_request('test-cache-do')
+        requests.get_request('test-cache-done', fields=['status'])
+        assert mock_get.call_count == 5
+
+        # Writes invalidate the cache.
+        with requests.update_request('test-cache-done') as request:
+            request.status = RequestStatus.PENDING
+        assert requests.get_request(
+            'test-cache-done').status == RequestStatus.PENDING
+        assert mock_get.call_count == 6
+
+        # Cached entries expire after the TTL.
+        with mock.patch.object(requests, '_REQUEST_CACHE_TTL_SECONDS', -1):
+            requests.set_request_succeeded('test-cache-done', None)
+            requests.get_request('test-cache-done')
+            requests.get_request('test-cache-done')
+        assert mock_get.call_count == 8
+
+
+@pytest.mark.asyncio
+async def test_connection_pragmas_on_sync_and_async_connections(
+        isolated_database):
+    """Test that the per-connection pragmas apply to both connections."""
+    # Initialize the database.
+    requests.get_request('test-request-pragmas')
+    # 1 is NORMAL.
+    assert requests._DB.conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+    async with requests._DB.execute_fetchall_async(
+            'PRAGMA synchronous') as rows:
+        assert rows[0][0] == 1
+    async with requests._DB.execute_fetchall_async('PRAGMA temp_store') as rows:
+        # 2 is MEMORY.
+        assert rows[0][0] == 2
+
+
+def test_get_request_does_not_cache_stale_reads(isolated_database):
+    """Test that a read racing with a write does not cache the stale row."""
+    requests.SqliteRequestBackend().add_or_update_requests([
+        requests.Request(request_id='test-cache-race',
+                         name='test-request',
+                         entrypoint=dummy,
+                         request_body=payloads.RequestBody(),
+                         status=RequestStatus.SUCCEEDED,
+                         created_at=time.time(),
+                         user_id='test-user')
+    ])
+    get_request_no_lock = requests._get_request_no_lock
+
+    def read_then_write(request_id, fields=None):
+        request = get_request_no_lock(request_id, fields)
+        # A write that commits after the read, but before the read result is
+        # cached.
+        with requests.update_request(request_id) as request_record:
+            request_record.status_msg = 'updated'
+        return request
+
+    with mock.patch.object(requests,
+                           '_get_request_no_lock',
+                           side_effect=read_then_write):
+        assert requests.get_request('test-cache-race').status_msg is None
+    assert requests.get_request('test-cache-race').status_msg == 'updated'
+
+    # Reads started before the tracked invalidations are evicted do not cache
+    # either.
+    request = requests.get_request('test-cache-race')
+    requests._invalidate_cached_requests(['test-cache-race'])
+    generation = requests._get_request_cache_generation()
+    requests._invalidate_cached_requests([
+        f'test-cache-other-{i}'
+        for i in range(requests._REQUEST_CACHE_MAX_INVALIDATIONS + 1)
+    ])
+    requests._cache_request('test-cache-race', request, generation)
+    assert requests._get_cached_request('test-cache-race') is None
+    # Reads started after the invalidations are cached.
+    requests._cache_request('test-cache-race', request,
+                            requests._get_request_cache_generation())
+    assert requests._get_cached_request('test-cache-race') == request
+
+
+def test_request_cache_releases_expired_entries(isolated_database):
+    """Test that inserts purge expired entries and the cache stays bounded."""
+    request = requests.Request(request_id='test-cache-expired',
+                               name='test-request',
+                               entrypoint=dummy,
+                               request_body=payloads.RequestBody(),
+                               status=RequestStatus.SUCCEEDED,
+                               created_at=time.time(),
+                               user_id='test-user')
+    generation = requests._get_request_cache_generation()
+    requests._cache_request('test-cache-expired', request, generation)
+    assert 'test-cache-expired' in requests._request_cache
+
+    # Inserting another request after the TTL releases the expired entry,
+    # even though it is never read again.
+    later = time.monotonic() + requests._REQUEST_CACHE_TTL_SECONDS + 1
+    with mock.patch.object(requests.time, 'monotonic', return_value=later):
+        other = copy.copy(request)
+        other.request_id = 'test-cache-other'
+        requests._cache_request('test-cache-other', other, generation)
+    assert list(requests._request_cache) == ['test-cache-other']
+
+    for i in range(requests._REQUEST_CACHE_MAX_SIZE * 2):
+        other = copy.copy(request)
+        other.request_id = f'test-cache-other-{i}'
+        requests._cache_request(other.request_id, other, generation)
+    assert len(requests._request_cache) == requests._REQUEST_CACHE_MAX_SIZE
@@ -95,6 +95,46 @@ async def test_execute_fetchall_async_error_does_not_stall_read_txn(
     assert values == ['initial', 'external', 'after_error']
 
 
+@pytest.mark.asyncio
+async def test_async_conn_closed_if_init_connection_fails(tmp_path):
+    """Test that the async connection does not leak if init fails."""
+    num_calls = 0
+
+    def init_connection(cursor):
+        nonlocal num_calls
+        num_calls += 1
+        # Only fail on the async connection, which is initialized second.
+        if num_calls > 1:
+            raise sqlite3.OperationalError('BOOM')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+
+    conn = db_utils.SQLiteConn(str(tmp_path / 'db_utils_init.db'),
+                               lambda cursor, conn: None,
+                               init_connection=init_connection)
+    connect = db_utils.aiosqlite.connect
+    async_conns = []
+
+    def connect_and_record(*args, **kwargs):
+        async_conn = connect(*args, **kwargs)
+        async_conns.append(async_conn)
+        return async_conn
+
+    try:
+        with mock.patch.object(db_utils.aiosqlite,
+                               'connect',
+                               side_effect=connect_and_record):
+            with pytest.raises(sqlite3.OperationalError):
+                async with conn.execute_fetchall_async('SELECT 1') as _:
+                    pass
+        assert len(async_conns) == 1
+        # The connection is closed and its thread is stopped.
+        assert async_conns[0]._connection is None
+        assert not async_conns[0]._running
+        assert conn._async_conn is None
+    finally:
+        await conn.close()
+
+
 class TestGetEngine:
     """Tests for get_engine function."""
 